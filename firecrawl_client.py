@@ -1,24 +1,141 @@
 #!/usr/bin/env python3
 import asyncio
-import openpyxl
-import pandas as pd
+import csv
+import hashlib
+import itertools
 import json
+import mmap
 import os
+import random
 import re
+import sys
+import tempfile
+import time
+from collections import deque
+from contextlib import AsyncExitStack
+from dataclasses import dataclass
 from pathlib import Path
 from datetime import datetime
+import anyio
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
+from mcp.shared.exceptions import McpError
+from mcp.types import CONNECTION_CLOSED, CallToolResult, TextContent
+from pydantic import BaseModel
+
+from firecrawl_utils import env_ok, preview, print_env_hint
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# What a broken or stalled MCP stdio transport raises; worth retrying
+_TRANSIENT_ERRORS = (asyncio.TimeoutError, anyio.ClosedResourceError,
+                     anyio.BrokenResourceError, McpError)
+# McpError codes for a request that timed out or lost its connection,
+# as opposed to one the server rejected
+_TRANSIENT_MCP_CODES = {408, -32001, CONNECTION_CLOSED}
+
+# Values returned as-is by the result walkers
+_SCALAR_TYPES = (int, float, bool, type(None))
+_PRIMITIVE_TYPES = (str, bytes) + _SCALAR_TYPES
+_PRIMITIVE_TYPE_SET = frozenset(_PRIMITIVE_TYPES)
+_JSON_NATIVE_TYPES = (dict, list, str) + _SCALAR_TYPES
+
+# Characters replaced with '_' when deriving a filename from a URL
+_FN_TABLE = str.maketrans({'/': '_', '.': '_', ':': '_'})
+
+# JSON output larger than this is written without indentation
+JSON_INDENT_MAX_BYTES = 1 << 20
+
+def _json_dumps(obj, indent=False, sort_keys=False):
+    """Encode obj as UTF-8 JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        option = (orjson.OPT_INDENT_2 if indent else 0) | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(obj, default=str, option=option)
+    return json.dumps(obj, indent=2 if indent else None, sort_keys=sort_keys,
+                      ensure_ascii=False, default=str).encode('utf-8')
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can
+# catch the stdlib exception either way
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# Shared stdlib encoder used when orjson isn't installed; values the
+# serializer leaves opaque (URLs, datetimes, ...) are written as strings
+_ENCODER_INDENT = json.JSONEncoder(indent=2, ensure_ascii=False, default=str)
+
+# Markdown output at least this long is written through mmap
+MARKDOWN_MMAP_MIN_CHARS = 8 << 20
+
+# Line templates for previewed items, picked by whether the text was cut
+_TRUNC = "    {}...\n"
+_FULL = "    {}\n"
+
+def split_markdown_reviews(markdown_text, name=None, price=None):
+    """
+    Splits Markdown-formatted reviews in the form:
+    [title](url): review text
+    into a list of structured dictionaries.
+    """
+    if not markdown_text:
+        return []
+
+    # Use regex to match [title](url): review
+    pattern = r"\[([^\]]+)\]\((https?://[^\)]+)\):\s*(.*?)(?=(\n\[|$))"
+    matches = re.findall(pattern, markdown_text, re.DOTALL)
+
+    results = []
+    for title, url, review, _ in matches:
+        results.append({
+            "name": name,
+            "price": price,
+            "title": title.strip(),
+            "url": url.strip(),
+            "review": review.strip().replace("\n", " ")
+        })
+
+    return results
+
+@dataclass
+class ScrapeResult:
+    """The text items of a scrape, plus the raw MCP result they came from"""
+    items: list[str]
+    raw: object = None
 
 class FirecrawlMCPClient:
-    def __init__(self, server_path=None):
+    # Output directories already created by save_to_file
+    _ensured_dirs: set[str] = set()
+    
+    def __init__(self, server_path=None, max_concurrency=5,
+                 cache_dir=None, cache_ttl_seconds=3600, use_cache=True,
+                 pool_size=1, debug=False):
         """
         Initialize the Firecrawl MCP client
         
         Args:
             server_path: Path to the Firecrawl MCP server JS file
                         If None, will try to find it automatically
+            max_concurrency: Maximum number of tool calls in flight at once
+                        when scraping several URLs
+            cache_dir: Directory holding cached tool results
+                        If None, uses ~/.cache/firecrawl_mcp
+            cache_ttl_seconds: How long a cached tool result stays valid
+            use_cache: Set to False to bypass the cache for every call
+            pool_size: Number of MCP server processes to spread tool calls over;
+                        one is enough for interactive use, while clients
+                        running large batches can ask for more
+            debug: Print raw tool results and parameters while scraping
         """
+        self.debug = debug
+        self.max_concurrency = max_concurrency
+        self.pool_size = max(1, pool_size)
+        if cache_dir is None:
+            cache_dir = Path.home() / ".cache" / "firecrawl_mcp"
+        self.cache_dir = Path(cache_dir)
+        self.use_cache = use_cache
+        self.cache_ttl_seconds = cache_ttl_seconds
+        
         if server_path is None:
             # Try to find the server automatically
             possible_paths = [
@@ -42,28 +159,61 @@ class FirecrawlMCPClient:
             args=[server_path],
             env=dict(os.environ)  # Pass current environment variables
         )
+        # Owns every stdio transport and session, in the order they were opened
+        self._exit_stack = None
+        self.sessions = []
+    
+    async def __aenter__(self):
+        await self.connect()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.disconnect()
     
     async def connect(self):
-        """Establish connection to the MCP server"""
-        self.stdio_client = stdio_client(self.server_params)
-        self.read, self.write = await self.stdio_client.__aenter__()
-        self.session = ClientSession(self.read, self.write)
-        await self.session.__aenter__()
-        await self.session.initialize()
-        print("✅ Connected to Firecrawl MCP server")
+        """
+        Establish connections to the MCP server
+        
+        The sessions are kept open and reused by every call until
+        disconnect(); calling connect() again while connected is a no-op.
+        """
+        if self._exit_stack is not None:
+            return
+        stack = AsyncExitStack()
+        sessions = []
+        try:
+            for _ in range(self.pool_size):
+                read, write = await stack.enter_async_context(stdio_client(self.server_params))
+                session = await stack.enter_async_context(ClientSession(read, write))
+                await session.initialize()
+                sessions.append(session)
+        except BaseException:
+            # Close whatever did open, so a later connect() starts afresh
+            await stack.aclose()
+            raise
+        self._exit_stack = stack
+        self.sessions = sessions
+        self._rr = itertools.cycle(self.sessions)
+        print(f"✅ Connected to Firecrawl MCP server ({len(self.sessions)} session(s))")
     
     async def disconnect(self):
-        """Close the connection"""
-        if hasattr(self, 'session'):
-            await self.session.__aexit__(None, None, None)
-        if hasattr(self, 'stdio_client'):
-            await self.stdio_client.__aexit__(None, None, None)
+        """Close all connections"""
+        # The exit stack tears down in reverse order of creation, each
+        # session before the transport it runs on
+        stack, self._exit_stack = self._exit_stack, None
+        self.sessions = []
+        if stack is not None:
+            await stack.aclose()
         print("❌ Disconnected from Firecrawl MCP server")
     
+    def _session(self):
+        """Return the next session from the pool, round-robin"""
+        return next(self._rr)
+    
     async def list_tools(self):
         """List all available tools"""
         try:
-            tools = await self.session.list_tools()
+            tools = await self._session().list_tools()
             print("\n📋 Available Tools:")
             for tool in tools.tools:
                 print(f"  • {tool.name}: {tool.description}")
@@ -75,7 +225,7 @@ class FirecrawlMCPClient:
     async def list_resources(self):
         """List all available resources"""
         try:
-            resources = await self.session.list_resources()
+            resources = await self._session().list_resources()
             print("\n📂 Available Resources:")
             for resource in resources.resources:
                 print(f"  • {resource.uri}: {resource.name}")
@@ -88,103 +238,424 @@ class FirecrawlMCPClient:
                 print(f"❌ Error listing resources: {e}")
                 return []
     
-    def save_to_file(self, data, filename=None, output_dir="output"):
+    def _cache_key(self, tool_name, params):
+        """Build the cache key for a tool call from its name and parameters"""
+        canonical = _json_dumps(params, sort_keys=True)
+        return hashlib.sha256(tool_name.encode('utf-8') + canonical).hexdigest()
+    
+    def _read_cache_file(self, path, ttl):
+        try:
+            if time.time() - path.stat().st_mtime > ttl:
+                return None
+            with open(path, 'rb') as f:
+                return _json_loads(f.read())
+        except (OSError, ValueError):
+            return None
+    
+    def _write_cache_file(self, path, value):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # A temp file of its own per write, so concurrent identical calls
+        # can't interleave; the last os.replace wins
+        with tempfile.NamedTemporaryFile(dir=path.parent, suffix='.tmp', delete=False) as f:
+            tmp_path = f.name
+            try:
+                f.write(_json_dumps(value))
+            except BaseException:
+                f.close()
+                os.unlink(tmp_path)
+                raise
+        os.replace(tmp_path, path)
+    
+    async def _cache_get(self, key, ttl=None):
+        """Return the cached tool result for key, or None if missing or expired"""
+        if ttl is None:
+            ttl = self.cache_ttl_seconds
+        path = self.cache_dir / f"{key}.json"
+        cached = await asyncio.to_thread(self._read_cache_file, path, ttl)
+        if cached is None:
+            return None
+        try:
+            return CallToolResult.model_validate(cached)
+        except ValueError:
+            return None
+    
+    async def _cache_put(self, key, value):
+        """Store a tool result in the cache"""
+        path = self.cache_dir / f"{key}.json"
+        try:
+            # Dump with pydantic itself, so URLs and aliased fields such as
+            # _meta survive the round trip through model_validate
+            dumped = value.model_dump(mode="json", by_alias=True)
+            await asyncio.to_thread(self._write_cache_file, path, dumped)
+        except Exception as e:
+            print(f"⚠️ Could not write cache entry: {e}")
+    
+    async def _call_tool(self, tool_name, params, use_cache=True, cache_ttl_seconds=None,
+                         max_retries=1, call_timeout=None):
+        """
+        Call a tool on the MCP server, going through the on-disk cache
+        
+        Args:
+            tool_name: Name of the MCP tool to call
+            params: Tool arguments
+            use_cache: Whether to read and write the on-disk cache
+            cache_ttl_seconds: Override the client's cache TTL for this call
+            max_retries: Attempts to make before giving up on timeouts and
+                        closed or broken transports; at least 1
+            call_timeout: Seconds to wait for each attempt, or None to wait
+                        indefinitely
+        """
+        if not (use_cache and self.use_cache):
+            return await self._call_with_retry(tool_name, params, max_retries, call_timeout)
+        
+        key = self._cache_key(tool_name, params)
+        if (cached := await self._cache_get(key, cache_ttl_seconds)) is not None:
+            print(f"⚡ Using cached {tool_name} result")
+            return cached
+        
+        result = await self._call_with_retry(tool_name, params, max_retries, call_timeout)
+        if not getattr(result, 'isError', False):
+            await self._cache_put(key, result)
+        return result
+    
+    async def _call_with_retry(self, tool_name, params, max_retries, call_timeout):
+        """Call a tool, retrying transient failures with jittered exponential backoff"""
+        if max_retries < 1:
+            raise ValueError(f"max_retries must be at least 1, got {max_retries}")
+        for attempt in range(max_retries):
+            try:
+                return await asyncio.wait_for(
+                    self._session().call_tool(tool_name, params), call_timeout
+                )
+            except _TRANSIENT_ERRORS as e:
+                if isinstance(e, McpError) and e.error.code not in _TRANSIENT_MCP_CODES:
+                    raise
+                if attempt == max_retries - 1:
+                    raise
+                delay = 0.5 * 2 ** attempt + random.random() * 0.2
+                print(f"⚠️  {tool_name} attempt {attempt + 1} failed ({type(e).__name__}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+    
+    async def save_to_file(self, data, filename=None, output_dir="output", skip_markdown=False):
         """
         Save data to a file
         
+        The JSON and markdown files are written concurrently in worker
+        threads, so the event loop keeps serving other requests meanwhile.
+        
         Args:
             data: The data to save
             filename: Optional filename. If None, will generate based on timestamp
             output_dir: Directory to save files in
+            skip_markdown: Only write the JSON file
         """
         # Create output directory if it doesn't exist
-        Path(output_dir).mkdir(exist_ok=True)
+        if output_dir not in self._ensured_dirs:
+            Path(output_dir).mkdir(exist_ok=True)
+            self._ensured_dirs.add(output_dir)
         
         # Generate filename if not provided
         if filename is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"firecrawl_result_{timestamp}"
         
-        # Save as JSON
+        # Save as JSON and, if the data contains text content, as markdown/text
         json_path = Path(output_dir) / f"{filename}.json"
+        md_path = Path(output_dir) / f"{filename}.md"
+        if skip_markdown or not self._has_text_content(data):
+            await asyncio.to_thread(self._save_json, json_path, data)
+            return json_path, None
+        
+        _, has_text = await asyncio.gather(
+            asyncio.to_thread(self._save_json, json_path, data),
+            asyncio.to_thread(self._save_markdown, md_path, data)
+        )
+        
+        return json_path, md_path if has_text else None
+
+    def _has_text_content(self, data):
+        """
+        Cheap check on the top level of data for anything worth a markdown file
+        
+        Only rules out tool results whose content items carry no text; any
+        other shape is left to the full walk in _iter_text_content.
+        """
+        content = getattr(data, 'content', None)
+        if isinstance(content, (list, tuple)):
+            return any(hasattr(item, 'text') for item in content)
+        return True
+
+    def _save_json(self, path, data):
+        """Save data to path as JSON"""
         try:
-            # Convert result to serializable format
-            if hasattr(data, '__dict__'):
-                serializable_data = self._make_serializable(data)
-            else:
-                serializable_data = data
-                
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(serializable_data, f, indent=2, ensure_ascii=False)
-            print(f"💾 Saved JSON to: {json_path}")
+            self._write_json(path, data)
+            print(f"💾 Saved JSON to: {path}")
         except Exception as e:
             print(f"❌ Error saving JSON: {e}")
-        
-        # If the data contains text content, also save as markdown/text
-        text_content = self._extract_text_content(data)
-        if text_content:
-            md_path = Path(output_dir) / f"{filename}.md"
-            try:
-                with open(md_path, 'w', encoding='utf-8') as f:
-                    f.write(text_content)
-                print(f"📝 Saved Markdown to: {md_path}")
-            except Exception as e:
-                print(f"❌ Error saving Markdown: {e}")
-        
-        return json_path, md_path if text_content else None
 
-    def split_markdown_reviews(markdown_text, name=None, price=None):
+    def _save_markdown(self, path, data):
+        """Save the text content of data to path; returns whether there was any"""
+        try:
+            has_text = self._write_markdown(path, self._iter_text_content(data))
+            if has_text:
+                print(f"📝 Saved Markdown to: {path}")
+            return has_text
+        except Exception as e:
+            print(f"❌ Error saving Markdown: {e}")
+            return True
+
+    def _write_markdown(self, path, chunks):
         """
-        Splits Markdown-formatted reviews in the form:
-        [title](url): review text
-        into a list of structured dictionaries.
+        Stream text chunks to path, separated by blank lines
+        
+        Up to MARKDOWN_MMAP_MIN_CHARS of text is buffered and written
+        normally; anything larger is copied into a memory-mapped file.
+        Returns False without creating the file if there is no non-empty
+        chunk.
         """
-        if not markdown_text:
-            return []
+        chunks = iter(chunks)
+        first = next(chunks, None)
+        # Hold back leading empty chunks until some text turns up; their
+        # separators still go in front of it
+        skipped = 0
+        while first == '':
+            skipped += 1
+            first = next(chunks, None)
+        if first is None:
+            return False
+        if skipped:
+            first = '\n\n' * skipped + first
+        
+        buffered = [first]
+        size = len(first)
+        for chunk in chunks:
+            buffered.append(chunk)
+            size += len(chunk) + 2
+            if size >= MARKDOWN_MMAP_MIN_CHARS:
+                self._write_markdown_mmap(path, itertools.chain(buffered, chunks), size)
+                return True
+        
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(buffered[0])
+            for chunk in buffered[1:]:
+                f.write('\n\n')
+                f.write(chunk)
+        return True
 
-        # Use regex to match [title](url): review
-        pattern = r"\[([^\]]+)\]\((https?://[^\)]+)\):\s*(.*?)(?=(\n\[|$))"
-        matches = re.findall(pattern, markdown_text, re.DOTALL)
+    def _write_markdown_mmap(self, path, chunks, size_hint):
+        """Copy text chunks into a memory-mapped file, growing it as needed"""
+        with open(path, 'w+b') as f:
+            capacity = max(size_hint * 2, mmap.PAGESIZE)
+            f.truncate(capacity)
+            buf = mmap.mmap(f.fileno(), capacity)
+            offset = 0
+            try:
+                for i, chunk in enumerate(chunks):
+                    data = chunk.encode('utf-8')
+                    if i:
+                        data = b'\n\n' + data
+                    end = offset + len(data)
+                    if end > capacity:
+                        # Remap rather than mmap.resize(), which isn't
+                        # available on every platform
+                        capacity = max(end, capacity * 2)
+                        buf.close()
+                        f.truncate(capacity)
+                        buf = mmap.mmap(f.fileno(), capacity)
+                    buf[offset:end] = data
+                    offset = end
+                buf.flush()
+            finally:
+                buf.close()
+            f.truncate(offset)
 
-        results = []
-        for title, url, review, _ in matches:
-            results.append({
-                "name": name,
-                "price": price,
-                "title": title.strip(),
-                "url": url.strip(),
-                "review": review.strip().replace("\n", " ")
-            })
+    def _write_json(self, path, data):
+        """Write data to path as JSON, using orjson when it is installed"""
+        if orjson is not None:
+            # orjson walks JSON-native values in C and only calls back into
+            # _json_default for model objects. Non-string keys are written
+            # as strings, as json.dump does
+            option = orjson.OPT_NON_STR_KEYS
+            default = self._json_default
+            try:
+                encoded = orjson.dumps(data, default=default, option=option)
+            except orjson.JSONEncodeError:
+                # e.g. a cycle, which the full walker breaks up
+                data = self._make_serializable(data)
+                default = str
+                encoded = orjson.dumps(data, default=default, option=option)
+            if len(encoded) < JSON_INDENT_MAX_BYTES:
+                # Small payloads stay human-readable
+                encoded = orjson.dumps(data, default=default,
+                                       option=option | orjson.OPT_INDENT_2)
+            with open(path, 'wb') as f:
+                f.write(encoded)
+            return
         
-        return results 
+        # Convert result to serializable format; JSON-native values
+        # can be written as they are
+        if not isinstance(data, _JSON_NATIVE_TYPES):
+            data = self._make_serializable(data)
+        
+        # Stream the encoder's chunks through a 64KB buffer rather than
+        # building the whole document in memory
+        with open(path, 'w', encoding='utf-8', buffering=65536) as f:
+            f.writelines(_ENCODER_INDENT.iterencode(data))
 
-    def _make_serializable(self, obj):
+    def _json_default(self, obj):
+        """Convert one non-JSON-native object a level deep for orjson"""
+        if isinstance(obj, BaseModel):
+            # pydantic knows how to write its own URLs and aliased fields
+            return obj.model_dump(mode="json", by_alias=True)
+        try:
+            attrs = vars(obj)
+        except TypeError:
+            attrs = None
+        if attrs is not None:
+            return {k: v for k, v in attrs.items() if not k.startswith('_')}
+        if hasattr(obj, '__iter__') and not isinstance(obj, (str, bytes)):
+            return list(obj)
+        raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+    async def split_reviews(self, markdown_text, name=None, price=None):
+        """Run split_markdown_reviews in a worker thread, off the event loop"""
+        return await asyncio.to_thread(split_markdown_reviews, markdown_text, name, price)
+
+    def _make_serializable(self, obj, _memo=None):
         """Convert object to JSON-serializable format"""
-        if hasattr(obj, '__dict__'):
-            result = {}
-            for key, value in obj.__dict__.items():
-                if key.startswith('_'):
+        # Walk the tree with an explicit stack of (container, key, value)
+        # entries so deeply nested results can't hit the recursion limit.
+        # Leaves of an exact primitive type are copied straight into their
+        # parent and never pushed, which skips most of the per-node work.
+        #
+        # Containers and objects are memoized by id, so a sub-object shared
+        # by several parents is converted once, and a reference back to an
+        # object still being converted (a cycle) becomes None. A (None, id,
+        # None) entry marks where a node's children end.
+        memo = {} if _memo is None else _memo
+        in_progress = set()
+        leaf_types = _PRIMITIVE_TYPE_SET
+        intern = sys.intern
+        root = [None]
+        stack = [(root, 0, obj)]
+        push = stack.append
+        pop = stack.pop
+        while stack:
+            container, key, value = pop()
+            if container is None:
+                in_progress.discard(key)
+                continue
+            if isinstance(value, _PRIMITIVE_TYPES):
+                container[key] = value
+                continue
+            
+            node_id = id(value)
+            if node_id in memo:
+                container[key] = None if node_id in in_progress else memo[node_id][1]
+                continue
+            
+            if isinstance(value, dict):
+                result = container[key] = {}
+                # Share one copy of each repeated key across the output
+                items = [
+                    (intern(k) if type(k) is str else k, v)
+                    for k, v in value.items()
+                ]
+            elif isinstance(value, (list, tuple)):
+                result = container[key] = [None] * len(value)
+                items = enumerate(value)
+            elif isinstance(value, BaseModel):
+                # pydantic knows how to write its own URLs and aliased fields
+                result = container[key] = value.model_dump(mode="json", by_alias=True)
+                memo[node_id] = (value, result)
+                continue
+            else:
+                try:
+                    attrs = vars(value)
+                except TypeError:
+                    attrs = None
+                if attrs is not None:
+                    result = container[key] = {}
+                    memo[node_id] = (value, result)
+                    in_progress.add(node_id)
+                    push((None, node_id, None))
+                    for k, v in attrs.items():
+                        if k.startswith('_'):
+                            continue
+                        if type(v) in leaf_types:
+                            result[k] = v
+                        else:
+                            result[k] = None
+                            push((result, k, v))
                     continue
-                result[key] = self._make_serializable(value)
-            return result
-        elif hasattr(obj, '__iter__') and not isinstance(obj, (str, bytes)):
-            return [self._make_serializable(item) for item in obj]
-        else:
-            return obj
+                elif hasattr(value, '__iter__'):
+                    values = list(value)
+                    result = container[key] = [None] * len(values)
+                    items = enumerate(values)
+                else:
+                    container[key] = value
+                    continue
+            
+            # Keep a reference to value so its id can't be reused mid-walk
+            memo[node_id] = (value, result)
+            in_progress.add(node_id)
+            push((None, node_id, None))
+            for k, v in items:
+                if type(v) in leaf_types:
+                    result[k] = v
+                else:
+                    result[k] = None
+                    push((result, k, v))
+        return root[0]
     
-    def save_to_table(self, result, filename: str, format: str = "excel"):
-        if not hasattr(result, 'content') or not result.content:
+    def save_to_table(self, result, filename: str, format: str = "excel", use_pandas: bool = False):
+        """
+        Save a tool result's text items, or a list of rows, as a table
+        
+        Args:
+            result: A tool result, or a list of rows; rows that are dicts
+                        become columns named by their keys
+            filename: Output path without the extension
+            format: "excel" or "csv"
+            use_pandas: Write through a pandas DataFrame
+        """
+        if isinstance(result, list):
+            data = result
+        elif hasattr(result, 'content') and result.content:
+            data = [item.text for item in result.content]
+        else:
+            data = None
+        if not data:
             print("⚠️ No content to save.")
             return
         
         try:
-            data = [item.text for item in result.content]
-            df = pd.DataFrame(data)
+            rows = self._table_rows(data)
 
-            if format == "csv":
-                df.to_csv(f"{filename}.csv", index=False)
+            if use_pandas:
+                import pandas as pd
+                df = pd.DataFrame(data)
+                if format == "csv":
+                    df.to_csv(f"{filename}.csv", index=False)
+                elif format == "excel":
+                    df.to_excel(f"{filename}.xlsx", index=False, engine='openpyxl')
+                else:
+                    print(f"⚠️ Unsupported format: {format}")
+                    return
+            elif format == "csv":
+                with open(f"{filename}.csv", 'w', newline='', encoding='utf-8') as f:
+                    writer = csv.writer(f)
+                    writer.writerows(rows)
             elif format == "excel":
-                df.to_excel(f"{filename}.xlsx", index=False, engine='openpyxl')
+                import xlsxwriter
+                # constant_memory flushes each row to disk as soon as it is written
+                workbook = xlsxwriter.Workbook(f"{filename}.xlsx", {'constant_memory': True})
+                try:
+                    worksheet = workbook.add_worksheet()
+                    for row, values in enumerate(rows):
+                        worksheet.write_row(row, 0, values)
+                finally:
+                    workbook.close()
             else:
                 print(f"⚠️ Unsupported format: {format}")
                 return
@@ -193,29 +664,45 @@ class FirecrawlMCPClient:
         except Exception as e:
             print(f"❌ Failed to save table: {e}")
 
-    def _extract_text_content(self, data):
-        """Extract text content from the result for markdown saving"""
-        text_parts = []
-        
-        def extract_text(obj, level=0):
-            if hasattr(obj, 'text'):
-                text_parts.append(obj.text)
-            elif hasattr(obj, 'content'):
-                if isinstance(obj.content, str):
-                    text_parts.append(obj.content)
-                elif hasattr(obj.content, '__iter__'):
-                    for item in obj.content:
-                        extract_text(item, level + 1)
-            elif hasattr(obj, '__iter__') and not isinstance(obj, str):
-                for item in obj:
-                    extract_text(item, level + 1)
+    def _table_rows(self, data):
+        """Lay data out as table rows: a header plus one row per dict, or one cell per item"""
+        if not all(isinstance(item, dict) for item in data):
+            return [[item if isinstance(item, str) else str(item)] for item in data]
+        header = list(dict.fromkeys(key for item in data for key in item))
+        rows = [header]
+        for item in data:
+            rows.append([
+                value if value is None or isinstance(value, _PRIMITIVE_TYPES) else str(value)
+                for value in (item.get(key) for key in header)
+            ])
+        return rows
+
+    def _iter_text_content(self, data):
+        """Yield the text content of the result for markdown saving"""
+        pending = deque([data])
+        while pending:
+            obj = pending.popleft()
+            # Text items are by far the most common node, so check them first
+            if isinstance(obj, TextContent):
+                yield obj.text
             elif isinstance(obj, str):
-                text_parts.append(obj)
-        
-        extract_text(data)
-        return '\n\n'.join(text_parts) if text_parts else None
+                yield obj
+            elif isinstance(obj, _SCALAR_TYPES):
+                continue
+            elif hasattr(obj, 'text'):
+                yield obj.text
+            elif hasattr(obj, 'content'):
+                content = obj.content
+                if isinstance(content, str):
+                    yield content
+                elif hasattr(content, '__iter__'):
+                    # Visit children next, keeping their original order
+                    pending.extendleft(reversed(list(content)))
+            elif hasattr(obj, '__iter__'):
+                pending.extendleft(reversed(list(obj)))
     
-    async def crawl_url(self, url, save_to_file=False, filename=None, **kwargs):
+    async def crawl_url(self, url, save_to_file=False, filename=None,
+                        use_cache=True, cache_ttl_seconds=None, **kwargs):
         """
         Crawl a single URL
         
@@ -223,31 +710,38 @@ class FirecrawlMCPClient:
             url: The URL to crawl
             save_to_file: Whether to save results to file
             filename: Optional filename for saving
+            use_cache: Whether to reuse a cached result for the same request
+            cache_ttl_seconds: Override the client's cache TTL for this call
             **kwargs: Additional parameters for crawling
         """
         try:
-            result = await self.session.call_tool(
+            result = await self._call_tool(
                 "crawl_url", 
                 {
                     "url": url,
                     **kwargs
-                }
+                },
+                use_cache=use_cache,
+                cache_ttl_seconds=cache_ttl_seconds
             )
             print(f"✅ Successfully crawled: {url}")
             
             if save_to_file:
                 if filename is None:
                     # Generate filename from URL
-                    filename = url.replace("https://", "").replace("http://", "").replace("/", "_").replace(".", "_")
-                    filename = f"crawl_{filename}"
-                self.save_to_file(result, filename)
+                    filename = "crawl_" + url.removeprefix("https://").removeprefix("http://").translate(_FN_TABLE)
+                await self.save_to_file(result, filename)
             
             return result
         except Exception as e:
             print(f"❌ Error crawling {url}: {e}")
             return None
     
-    async def firecrawl_scrape(self, url, save_to_file=False, filename=None, **kwargs):
+    async def firecrawl_scrape(self, url, save_to_file=False, filename=None,
+                               formats=("markdown",), only_main_content=True,
+                               max_age=3_600_000, store_in_cache=True,
+                               use_cache=True, cache_ttl_seconds=None,
+                               max_retries=3, call_timeout=60, **kwargs):
         """
         Scrape a single URL
         
@@ -255,48 +749,80 @@ class FirecrawlMCPClient:
             url: The URL to scrape
             save_to_file: Whether to save results to file
             filename: Optional filename for saving
+            formats: Content formats to request; heavier formats such as
+                        html or screenshot must be asked for explicitly.
+                        Empty leaves the choice to the server
+            only_main_content: Strip navigation, headers and footers
+            max_age: Accept a copy from Firecrawl's server-side cache up to
+                        this many milliseconds old; 0 forces a fresh scrape
+            store_in_cache: Whether Firecrawl may cache this scrape
+                        (only_main_content, max_age and store_in_cache are
+                        left out of the request when None)
+            use_cache: Whether to reuse a cached result for the same request
+            cache_ttl_seconds: Override the client's cache TTL for this call
+            max_retries: Attempts to make before giving up on timeouts and
+                        closed or broken transports
+            call_timeout: Seconds to wait for each attempt
             **kwargs: Additional parameters for scraping
+        
+        Returns a ScrapeResult, or None if the scrape failed.
         """
         try:
             # Debug: Print the exact parameters being sent
-            params = {"url": url, **kwargs}
-            print(f"🔍 Scraping with params: {params}")
+            params = {"url": url}
+            if formats:
+                params["formats"] = list(formats)
+            options = {
+                "onlyMainContent": only_main_content,
+                "maxAge": max_age,
+                "storeInCache": store_in_cache,
+            }
+            params.update((k, v) for k, v in options.items() if v is not None)
+            params.update(kwargs)
+            if self.debug:
+                print(f"🔍 Scraping with params: {params}")
             
-            result = await self.session.call_tool("firecrawl_scrape", params)
+            result = await self._call_tool(
+                "firecrawl_scrape", params,
+                use_cache=use_cache,
+                cache_ttl_seconds=cache_ttl_seconds,
+                max_retries=max_retries,
+                call_timeout=call_timeout
+            )
             
             # Debug: Print raw result structure
-            print(f"📊 Raw result type: {type(result)}")
-            print(f"📊 Raw result: {result}")
-            
-            # Check if result has expected structure
-            if hasattr(result, 'content'):
-                print(f"📊 Result.content type: {type(result.content)}")
-                if isinstance(result.content, list):
-                    print(f"📊 Content list length: {len(result.content)}")
-                    for i, item in enumerate(result.content[:3]):  # Show first 3 items
-                        print(f"📊 Content[{i}] type: {type(item)}")
-                        print(f"📊 Content[{i}]: {item}")
-                else:
-                    print(f"📊 Content: {result.content}")
-            
-            # Check for different possible response structures
-            if hasattr(result, 'data'):
-                print(f"📊 Result.data: {result.data}")
-            if hasattr(result, 'results'):
-                print(f"📊 Result.results: {result.results}")
-            if hasattr(result, 'text'):
-                print(f"📊 Result.text: {result.text[:500]}...")
+            if self.debug:
+                print(f"📊 Raw result type: {type(result)}")
+                print(f"📊 Raw result: {result}")
+                
+                # Check if result has expected structure
+                if hasattr(result, 'content'):
+                    print(f"📊 Result.content type: {type(result.content)}")
+                    if isinstance(result.content, list):
+                        print(f"📊 Content list length: {len(result.content)}")
+                        for i, item in enumerate(result.content[:3]):  # Show first 3 items
+                            print(f"📊 Content[{i}] type: {type(item)}")
+                            print(f"📊 Content[{i}]: {item}")
+                    else:
+                        print(f"📊 Content: {result.content}")
+                
+                # Check for different possible response structures
+                if hasattr(result, 'data'):
+                    print(f"📊 Result.data: {result.data}")
+                if hasattr(result, 'results'):
+                    print(f"📊 Result.results: {result.results}")
+                if hasattr(result, 'text'):
+                    print(f"📊 Result.text: {result.text[:500]}...")
             
             print(f"✅ Successfully scraped: {url}")
             
             if save_to_file:
                 if filename is None:
                     # Generate filename from URL
-                    filename = url.replace("https://", "").replace("http://", "").replace("/", "_").replace(".", "_")
-                    filename = f"scrape_{filename}"
-                self.save_to_file(result, filename)
+                    filename = "scrape_" + url.removeprefix("https://").removeprefix("http://").translate(_FN_TABLE)
+                await self.save_to_file(result, filename)
             
-            return result
+            return self._normalize(result)
         except Exception as e:
             print(f"❌ Error scraping {url}: {e}")
             print(f"❌ Exception type: {type(e)}")
@@ -304,10 +830,73 @@ class FirecrawlMCPClient:
             traceback.print_exc()
             return None
 
+    def _normalize(self, raw):
+        """Flatten a raw MCP tool result into a ScrapeResult of text items"""
+        content = getattr(raw, 'content', None)
+        if content is None:
+            items = [str(raw)]
+        elif isinstance(content, str):
+            items = [content]
+        elif hasattr(content, '__iter__'):
+            items = [item.text if hasattr(item, 'text') else str(item) for item in content]
+        else:
+            items = [content.text if hasattr(content, 'text') else str(content)]
+        return ScrapeResult(items=items, raw=raw)
+
+    async def firecrawl_scrape_stream(self, url, **kwargs):
+        """
+        Scrape a single URL and yield its text items one at a time
+        
+        The MCP tool call delivers the whole result at once, so this wraps it
+        in an async generator that hands each item over and drops the
+        result's own reference to it, letting callers process large results
+        item by item without keeping every item alive.
+        
+        Args:
+            url: The URL to scrape
+            **kwargs: Additional parameters passed to firecrawl_scrape
+        """
+        result = await self.firecrawl_scrape(url, **kwargs)
+        if result is None:
+            return
+        # Keep only the items: the raw result holds the same strings and
+        # would otherwise keep every one of them alive until the end
+        items = result.items
+        del result
+        items.reverse()
+        while items:
+            yield items.pop()
+
+    async def firecrawl_batch_scrape(self, urls, max_concurrency=None, **kwargs):
+        """
+        Scrape several URLs concurrently
+        
+        At most ``max_concurrency`` scrapes run at the same time; keep it
+        modest (5-20) to stay within the Firecrawl API's rate limits. Results
+        are returned in the same order as ``urls``; a URL that fails yields
+        its exception (or None) instead of aborting the whole batch.
+        
+        Args:
+            urls: The URLs to scrape
+            max_concurrency: Override the client's max_concurrency for this batch
+            **kwargs: Additional parameters passed to firecrawl_scrape
+        """
+        sem = asyncio.Semaphore(max_concurrency or self.max_concurrency)
+        
+        async def scrape_one(url):
+            async with sem:
+                return await self.firecrawl_scrape(url, **kwargs)
+        
+        return await asyncio.gather(
+            *(scrape_one(url) for url in urls),
+            return_exceptions=True
+        )
+
     async def firecrawl_extract(self, urls, prompt, system_prompt, schema, 
                             allow_external_links=False, enable_web_search=False, 
                             include_subdomains=False, save_to_file=False,
-                            save_as_excel=False, filename=None):
+                            save_as_excel=False, filename=None,
+                            use_cache=True, cache_ttl_seconds=None):
         try:
             params = {
                 "urls": urls,
@@ -318,22 +907,19 @@ class FirecrawlMCPClient:
                 "enableWebSearch": enable_web_search,
                 "includeSubdomains": include_subdomains
             }
-            print(f"🧠 Extracting with params: {json.dumps(params, indent=2)}")
-            result = await self.session.call_tool("firecrawl_extract", params)
+            if self.debug:
+                print(f"🧠 Extracting with params: {_json_dumps(params, indent=True).decode('utf-8')}")
+            result = await self._call_tool(
+                "firecrawl_extract", params,
+                use_cache=use_cache,
+                cache_ttl_seconds=cache_ttl_seconds
+            )
 
             if save_as_excel:
-                if hasattr(result, 'content') and isinstance(result.content, list):
-                    for item in result.content:
-                        data = item.text if hasattr(item, 'text') else {}
-                        if isinstance(data, dict):
-                            if "description" in data and isinstance(data["description"], str):
-                                # 🔍 Split markdown-formatted reviews
-                                reviews = split_markdown_reviews(data["description"], name=data.get("name"))
-                                self.save_to_table(reviews, filename or "extract.xlsx", format="excel")
-                            else:
-                                # Save raw dictionary as a single row
-                                self.save_to_table([data], filename or "extract.xlsx", format="excel")
-                    print(f"✅ Excel saved to: {filename or 'extract.xlsx'}")
+                rows = await self._extract_rows(result)
+                if rows:
+                    table_name = os.path.splitext(filename)[0] if filename else "extract"
+                    self.save_to_table(rows, table_name, format="excel")
                 else:
                     print("⚠️ No structured content found to save as Excel.")
 
@@ -341,7 +927,7 @@ class FirecrawlMCPClient:
                 if not filename:
                     filename = f"extract_{datetime.now().isoformat().replace(':', '_')}.json"
                 filepath = Path(filename).resolve()
-                self.save_to_file(result, str(filepath))
+                await self.save_to_file(result, str(filepath))
                 print(f"✅ Result saved to: {filepath}")
 
             return result
@@ -351,7 +937,32 @@ class FirecrawlMCPClient:
             traceback.print_exc()
             return None
             
-    async def search(self, query, save_to_file=False, filename=None, **kwargs):
+    async def _extract_rows(self, result):
+        """
+        Turn the JSON objects in an extract result into table rows
+        
+        Objects whose description holds markdown-formatted reviews are
+        split into one row per review; other objects become a single row.
+        """
+        rows = []
+        for item in getattr(result, 'content', None) or ():
+            try:
+                data = _json_loads(item.text) if hasattr(item, 'text') else None
+            except ValueError:
+                continue
+            if not isinstance(data, dict):
+                continue
+            if isinstance(data.get("description"), str):
+                # 🔍 Split markdown-formatted reviews
+                rows.extend(await self.split_reviews(
+                    data["description"], name=data.get("name"), price=data.get("price")
+                ))
+            else:
+                rows.append(data)
+        return rows
+    
+    async def search(self, query, save_to_file=False, filename=None,
+                     use_cache=True, cache_ttl_seconds=None, **kwargs):
         """
         Search using Firecrawl
         
@@ -359,64 +970,59 @@ class FirecrawlMCPClient:
             query: Search query
             save_to_file: Whether to save results to file
             filename: Optional filename for saving
+            use_cache: Whether to reuse a cached result for the same request
+            cache_ttl_seconds: Override the client's cache TTL for this call
             **kwargs: Additional search parameters
         """
         try:
-            result = await self.session.call_tool(
+            result = await self._call_tool(
                 "search",
                 {
                     "query": query,
                     **kwargs
-                }
+                },
+                use_cache=use_cache,
+                cache_ttl_seconds=cache_ttl_seconds
             )
             print(f"✅ Search completed for: {query}")
             
             if save_to_file:
                 if filename is None:
                     filename = f"search_{query.replace(' ', '_')}"
-                self.save_to_file(result, filename)
+                await self.save_to_file(result, filename)
             
             return result
         except Exception as e:
             print(f"❌ Error searching for '{query}': {e}")
             return None
 
-async def debug_main():
+async def debug_main(use_cache=True):
     """Debug version to understand the response structure"""
     
-    if not os.getenv('FIRECRAWL_API_KEY'):
-        print("⚠️  Warning: FIRECRAWL_API_KEY environment variable not set")
-        print("   Set it with: export FIRECRAWL_API_KEY='your_api_key_here'")
+    if not env_ok():
+        print_env_hint()
         return
     
+    client = None
     try:
-        client = FirecrawlMCPClient()
+        client = FirecrawlMCPClient(debug=True, use_cache=use_cache)
         await client.connect()
         
         # First, let's see what tools are available
         print("\n🔧 Available tools:")
         tools = await client.list_tools()
         
-        # Try a simple URL first
-        print("\n🔍 Testing with a simple URL...")
-        result = await client.firecrawl_scrape("https://example.com")
-        
-        # Try the Anthropic URL with different parameters
-        print("\n🔍 Testing Anthropic URL with minimal params...")
-        result = await client.firecrawl_scrape(
-            "https://en.volleyballworld.com/volleyball/competitions/volleyball-nations-league/standings/men/"
-        )
-        
-        print("\n🔍 Testing Anthropic URL with formats specified...")
-        result = await client.firecrawl_scrape(
-            "https://en.volleyballworld.com/volleyball/competitions/volleyball-nations-league/standings/men/",
-            formats=["markdown"]
-        )
-        
-        print("\n🔍 Testing Anthropic URL with different format...")
-        result = await client.firecrawl_scrape(
-            "https://en.volleyballworld.com/volleyball/competitions/volleyball-nations-league/standings/men/",
-            format="markdown"  # singular instead of plural
+        # Try a simple URL and the standings URL with different parameters,
+        # all in parallel
+        url = "https://en.volleyballworld.com/volleyball/competitions/volleyball-nations-league/standings/men/"
+        print("\n🔍 Testing a simple URL and the standings URL with different params...")
+        bare = dict(formats=(), only_main_content=None, max_age=None, store_in_cache=None)
+        results = await asyncio.gather(
+            client.firecrawl_scrape("https://example.com"),
+            client.firecrawl_scrape(url, **bare),  # minimal params: just the url
+            client.firecrawl_scrape(url),  # the client's defaults
+            client.firecrawl_scrape(url, **bare, format="markdown"),  # singular instead of plural
+            return_exceptions=True
         )
         
     except Exception as e:
@@ -424,20 +1030,21 @@ async def debug_main():
         import traceback
         traceback.print_exc()
     finally:
-        if 'client' in locals():
+        if client is not None:
             await client.disconnect()
 
-async def main():
+async def main(use_cache=True):
     """Example usage of the Firecrawl MCP client with file saving"""
     
     # Check if API key is set
-    if not os.getenv('FIRECRAWL_API_KEY'):
-        print("⚠️  Warning: FIRECRAWL_API_KEY environment variable not set")
-        print("   Set it with: export FIRECRAWL_API_KEY='your_api_key_here'")
+    if not env_ok():
+        print_env_hint()
+        return
     
     # Initialize client
+    client = None
     try:
-        client = FirecrawlMCPClient()
+        client = FirecrawlMCPClient(use_cache=use_cache)
         await client.connect()
         
         # List available tools and resources
@@ -519,14 +1126,76 @@ async def main():
     
     finally:
         # Clean up
-        if 'client' in locals():
+        if client is not None:
             await client.disconnect()
 
-def interactive_mode():
+async def _aenumerate(aiterable, start=0):
+    """enumerate() for async iterables"""
+    i = start
+    async for item in aiterable:
+        yield i, item
+        i += 1
+
+def _print_preview(result, label):
+    """Print a numbered preview of each text item of a ScrapeResult"""
+    # Collect the lines and write them at once rather than printing,
+    # and taking stdout's lock, twice per item
+    header = f"  {label} {{}}:\n"
+    lines = []
+    for i, text in enumerate(result.items, 1):
+        lines.append(header.format(i))
+        lines.append((_TRUNC if len(text) > 500 else _FULL).format(text[:500]))
+    if lines:
+        sys.stdout.write("".join(lines))
+
+# Bytes read from stdin past the last line _ainput returned
+_stdin_pending = bytearray()
+
+async def _read_stdin_chunk(fd):
+    """Wait until stdin is readable, then read what is there"""
+    loop = asyncio.get_running_loop()
+    readable = loop.create_future()
+    try:
+        loop.add_reader(fd, lambda: readable.done() or readable.set_result(None))
+    except (NotImplementedError, OSError):
+        # Regular files can't be watched (and never block); Windows loops
+        # can't watch pipes at all
+        return await asyncio.to_thread(os.read, fd, 65536)
+    try:
+        await readable
+    finally:
+        loop.remove_reader(fd)
+    return os.read(fd, 65536)
+
+async def _ainput(prompt=""):
+    """
+    Read a line from stdin without blocking the event loop
+    
+    stdin is only read once the loop reports it readable, so no thread is
+    left blocked in input() when a prompt is abandoned; Ctrl+C simply
+    cancels the wait. Raises EOFError at end of input, like input().
+    """
+    if prompt:
+        sys.stdout.write(prompt)
+        sys.stdout.flush()
+    fd = sys.stdin.fileno()
+    while (end := _stdin_pending.find(b'\n')) < 0:
+        chunk = await _read_stdin_chunk(fd)
+        if not chunk:
+            if not _stdin_pending:
+                raise EOFError
+            end = len(_stdin_pending)
+            break
+        _stdin_pending.extend(chunk)
+    line = bytes(_stdin_pending[:end])
+    del _stdin_pending[:end + 1]
+    return line.decode(sys.stdin.encoding or 'utf-8', errors='replace').rstrip('\r')
+
+def interactive_mode(use_cache=True):
     """Interactive mode for testing different operations with file saving options"""
     
     async def interactive():
-        client = FirecrawlMCPClient()
+        client = FirecrawlMCPClient(use_cache=use_cache)
         await client.connect()
         
         try:
@@ -541,8 +1210,9 @@ def interactive_mode():
                 print("5. Search")
                 print("6. Extract")
                 print("7. Exit")
+                print("8. Batch scrape")
                 
-                choice = input("\nEnter your choice (1-7): ").strip()
+                choice = (await _ainput("\nEnter your choice (1-8): ")).strip()
                 
                 if choice == "1":
                     await client.list_tools()
@@ -551,47 +1221,37 @@ def interactive_mode():
                     await client.list_resources()
                 
                 elif choice == "3":
-                    url = input("Enter URL to scrape: ").strip()
+                    url = (await _ainput("Enter URL to scrape: ")).strip()
                     if url:
-                        save_choice = input("Save to file? (y/n): ").strip().lower()
+                        save_choice = (await _ainput("Save to file? (y/n): ")).strip().lower()
                         save_to_file = save_choice == 'y'
                         filename = None
                         if save_to_file:
-                            filename = input("Enter filename (or press Enter for auto-generated): ").strip()
+                            filename = (await _ainput("Enter filename (or press Enter for auto-generated): ")).strip()
                             if not filename:
                                 filename = None
                         
-                        result = await client.firecrawl_scrape(url, save_to_file=save_to_file, filename=filename)
-                        if result and not save_to_file:
-                            print(f"\n📄 Scrape result preview:")
-                            # Show preview as before...
-                            print(f"Result type: {type(result)}")
-                            if hasattr(result, 'content'):
-                                if hasattr(result.content, '__iter__') and not isinstance(result.content, str):
-                                    for i, item in enumerate(result.content):
-                                        print(f"  Content {i+1}:")
-                                        if hasattr(item, 'text'):
-                                            preview = item.text[:500]
-                                            print(f"    {preview}{'...' if len(item.text) > 500 else ''}")
-                                        else:
-                                            print(f"    {str(item)[:500]}...")
-                                else:
-                                    if hasattr(result.content, 'text'):
-                                        preview = result.content.text[:1000]
-                                        print(f"Text: {preview}{'...' if len(result.content.text) > 1000 else ''}")
-                                    else:
-                                        print(f"Content: {str(result.content)[:1000]}...")
-                            else:
-                                print(f"Raw result: {str(result)[:1000]}...")
+                        if save_to_file:
+                            await client.firecrawl_scrape(url, save_to_file=save_to_file, filename=filename)
+                        else:
+                            # Preview items as they come so each can be freed
+                            # once printed
+                            stream = client.firecrawl_scrape_stream(url)
+                            async for i, item in _aenumerate(stream, 1):
+                                if i == 1:
+                                    print(f"\n📄 Scrape result preview:")
+                                print(f"  Content {i}:")
+                                print(f"    {preview(item, 500)}")
+                                del item
                 
                 elif choice == "4":
-                    url = input("Enter URL to crawl: ").strip()
+                    url = (await _ainput("Enter URL to crawl: ")).strip()
                     if url:
-                        save_choice = input("Save to file? (y/n): ").strip().lower()
+                        save_choice = (await _ainput("Save to file? (y/n): ")).strip().lower()
                         save_to_file = save_choice == 'y'
                         filename = None
                         if save_to_file:
-                            filename = input("Enter filename (or press Enter for auto-generated): ").strip()
+                            filename = (await _ainput("Enter filename (or press Enter for auto-generated): ")).strip()
                             if not filename:
                                 filename = None
                         
@@ -599,32 +1259,16 @@ def interactive_mode():
                         if result and not save_to_file:
                             print(f"\n🕷️ Crawl result preview:")
                             print(f"Result type: {type(result)}")
-                            if hasattr(result, 'content'):
-                                if hasattr(result.content, '__iter__') and not isinstance(result.content, str):
-                                    for i, item in enumerate(result.content):
-                                        print(f"  Content {i+1}:")
-                                        if hasattr(item, 'text'):
-                                            preview = item.text[:500]
-                                            print(f"    {preview}{'...' if len(item.text) > 500 else ''}")
-                                        else:
-                                            print(f"    {str(item)[:500]}...")
-                                else:
-                                    if hasattr(result.content, 'text'):
-                                        preview = result.content.text[:1000]
-                                        print(f"Text: {preview}{'...' if len(result.content.text) > 1000 else ''}")
-                                    else:
-                                        print(f"Content: {str(result.content)[:1000]}...")
-                            else:
-                                print(f"Raw result: {str(result)[:1000]}...")
+                            _print_preview(client._normalize(result), "Content")
                 
                 elif choice == "5":
-                    query = input("Enter search query: ").strip()
+                    query = (await _ainput("Enter search query: ")).strip()
                     if query:
-                        save_choice = input("Save to file? (y/n): ").strip().lower()
+                        save_choice = (await _ainput("Save to file? (y/n): ")).strip().lower()
                         save_to_file = save_choice == 'y'
                         filename = None
                         if save_to_file:
-                            filename = input("Enter filename (or press Enter for auto-generated): ").strip()
+                            filename = (await _ainput("Enter filename (or press Enter for auto-generated): ")).strip()
                             if not filename:
                                 filename = None
                         
@@ -632,39 +1276,23 @@ def interactive_mode():
                         if result and not save_to_file:
                             print(f"\n🔍 Search results preview:")
                             print(f"Result type: {type(result)}")
-                            if hasattr(result, 'content'):
-                                if hasattr(result.content, '__iter__') and not isinstance(result.content, str):
-                                    for i, item in enumerate(result.content):
-                                        print(f"  Result {i+1}:")
-                                        if hasattr(item, 'text'):
-                                            preview = item.text[:500]
-                                            print(f"    {preview}{'...' if len(item.text) > 500 else ''}")
-                                        else:
-                                            print(f"    {str(item)[:500]}...")
-                                else:
-                                    if hasattr(result.content, 'text'):
-                                        preview = result.content.text[:1000]
-                                        print(f"Text: {preview}{'...' if len(result.content.text) > 1000 else ''}")
-                                    else:
-                                        print(f"Content: {str(result.content)[:1000]}...")
-                            else:
-                                print(f"Raw result: {str(result)[:1000]}...")
+                            _print_preview(client._normalize(result), "Result")
                 elif choice == "6":
                     # NEW Extract functionality
-                    urls_input = input("Enter URL(s) to extract from (separate multiple URLs with commas): ").strip()
+                    urls_input = (await _ainput("Enter URL(s) to extract from (separate multiple URLs with commas): ")).strip()
                     if urls_input:
                         urls = [url.strip() for url in urls_input.split(',')]
-                        prompt = input("Enter extraction prompt: ").strip()
+                        prompt = (await _ainput("Enter extraction prompt: ")).strip()
                         if prompt:
                             print("\nOptional parameters:")
-                            system_prompt = input("System prompt (optional): ").strip()
+                            system_prompt = (await _ainput("System prompt (optional): ")).strip()
                             
                             # Ask about schema
-                            use_schema = input("Use JSON schema? (y/n): ").strip().lower() == 'y'
+                            use_schema = (await _ainput("Use JSON schema? (y/n): ")).strip().lower() == 'y'
                             schema = None
                             if use_schema:
                                 print("Enter JSON schema (or press Enter for a simple product example):")
-                                schema_input = input().strip()
+                                schema_input = (await _ainput()).strip()
                                 if not schema_input:
                                     schema = {
                                         "type": "object",
@@ -678,20 +1306,20 @@ def interactive_mode():
                                     print("Using default product schema")
                                 else:
                                     try:
-                                        schema = json.loads(schema_input)
+                                        schema = _json_loads(schema_input)
                                     except json.JSONDecodeError:
                                         print("Invalid JSON schema, proceeding without schema")
                             
-                            save_choice = input("Save to file? (y/n): ").strip().lower()
+                            save_choice = (await _ainput("Save to file? (y/n): ")).strip().lower()
                             save_to_file = save_choice == 'y'
                             filename = None
                             if save_to_file:
-                                filename = input("Enter filename (or press Enter for auto-generated): ").strip()
+                                filename = (await _ainput("Enter filename (or press Enter for auto-generated): ")).strip()
                                 if not filename:
                                     filename = None
                             save_as_excel = False
                             if save_to_file:
-                                excel_choice = input("Save as Excel? (y/n): ").strip().lower()
+                                excel_choice = (await _ainput("Save as Excel? (y/n): ")).strip().lower()
                                 save_as_excel = excel_choice == 'y'
                             # Final API call
                             result = await client.firecrawl_extract(
@@ -706,42 +1334,70 @@ def interactive_mode():
 
                             if result and not save_to_file:
                                 # 👇 Extract from markdown-style description if present
-                                if hasattr(result, 'content') and isinstance(result.content, list):
-                                    for item in result.content:
-                                        data = item.text if hasattr(item, 'text') else {}
-                                        if isinstance(data, dict) and "description" in data:
-                                            reviews = split_markdown_reviews(
-                                                markdown_text=data.get("description", ""),
-                                                name=data.get("name"),
-                                                price=data.get("price")
-                                            )
-                                            client.save_to_table(reviews, "tgif_reviews.xlsx", format="excel")
-                                            print("✅ Markdown reviews parsed and saved to tgif_reviews.xlsx")
+                                rows = await client._extract_rows(result)
+                                if rows:
+                                    client.save_to_table(rows, "tgif_reviews", format="excel")
                 
                 elif choice == "7":
                     break
                 
+                elif choice == "8":
+                    print("Enter URLs to scrape, one per line (empty line to finish):")
+                    urls = []
+                    while True:
+                        url = (await _ainput()).strip()
+                        if not url:
+                            break
+                        urls.append(url)
+                    if urls:
+                        save_choice = (await _ainput("Save to file? (y/n): ")).strip().lower()
+                        save_to_file = save_choice == 'y'
+                        
+                        results = await client.firecrawl_batch_scrape(urls, save_to_file=save_to_file)
+                        print(f"\n📦 Batch scrape results:")
+                        for url, result in zip(urls, results):
+                            if result is None or isinstance(result, Exception):
+                                print(f"  ❌ {url}")
+                            else:
+                                print(f"  ✅ {url}")
+                
                 else:
                     print("Invalid choice. Please try again.")
         
-        except KeyboardInterrupt:
-            print("\n\n👋 Goodbye!")
-        
         finally:
             await client.disconnect()
     
-    # Run the interactive session
-    asyncio.run(interactive())
+    # Run the interactive session. asyncio.run turns Ctrl+C into a
+    # cancellation, so the session still disconnects before this returns
+    try:
+        asyncio.run(interactive())
+    except (KeyboardInterrupt, EOFError):
+        print("\n\n👋 Goodbye!")
 
 if __name__ == "__main__":
-    import sys
+    # Fail fast, before starting an event loop or the MCP server
+    if not env_ok():
+        print_env_hint()
+        sys.exit(2)
+    
+    # uvloop's event loop is a drop-in, faster replacement when installed
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
+    args = sys.argv[1:]
+    # --no-cache always forces fresh tool calls, whatever the mode
+    use_cache = "--no-cache" not in args
+    args = [arg for arg in args if arg != "--no-cache"]
     
-    if len(sys.argv) > 1:
-        if sys.argv[1] == "--interactive":
-            interactive_mode()
-        elif sys.argv[1] == "--debug":
-            asyncio.run(debug_main())
+    if len(args) > 0:
+        if args[0] == "--interactive":
+            interactive_mode(use_cache=use_cache)
+        elif args[0] == "--debug":
+            asyncio.run(debug_main(use_cache=use_cache))
         else:
-            asyncio.run(main())
+            asyncio.run(main(use_cache=use_cache))
     else:
-        asyncio.run(main())
\ No newline at end of file
+        asyncio.run(main(use_cache=use_cache))
\ No newline at end of file
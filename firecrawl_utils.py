@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Small helpers shared by the Firecrawl client scripts
+
+This module must not import mcp or firecrawl_client, so the scripts can
+use it before deciding whether to load the client at all.
+"""
+
+import os
+
+def env_ok():
+    """Whether the server can reach Firecrawl: an API key, or a self-hosted API URL"""
+    return bool(os.getenv('FIRECRAWL_API_KEY') or os.getenv('FIRECRAWL_API_URL'))
+
+def print_env_hint():
+    """Tell the user how to configure Firecrawl access"""
+    print("❌ FIRECRAWL_API_KEY not found!")
+    print("   Set it with: export FIRECRAWL_API_KEY='your_api_key_here'")
+    print("   or point FIRECRAWL_API_URL at a self-hosted instance")
+
+def preview(value, limit):
+    """
+    Return the first limit characters of value, plus '...' if it was cut
+    
+    value is converted to a string at most once, and strings are used as-is.
+    """
+    text = value if isinstance(value, str) else str(value)
+    return text[:limit] + '...' if len(text) > limit else text
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Round-trip tests for the on-disk tool result cache
+"""
+
+import tempfile
+import unittest
+
+from mcp.types import CallToolResult, EmbeddedResource, TextContent, TextResourceContents
+
+from firecrawl_client import FirecrawlMCPClient
+
+
+class CacheRoundTripTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.client = FirecrawlMCPClient(server_path="unused.js", cache_dir=self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    async def round_trip(self, result):
+        key = self.client._cache_key("firecrawl_scrape", {"url": "https://example.com"})
+        await self.client._cache_put(key, result)
+        return await self.client._cache_get(key)
+
+    async def test_text_result(self):
+        result = CallToolResult(
+            content=[TextContent(type="text", text="# Example")],
+            _meta={"source": "test"}
+        )
+        cached = await self.round_trip(result)
+        self.assertEqual(cached, result)
+        self.assertEqual(cached.meta, {"source": "test"})
+
+    async def test_resource_uri(self):
+        result = CallToolResult(content=[
+            EmbeddedResource(type="resource", resource=TextResourceContents(
+                uri="https://example.com/page", mimeType="text/markdown", text="# Page"
+            ))
+        ])
+        cached = await self.round_trip(result)
+        self.assertEqual(cached, result)
+
+
+if __name__ == "__main__":
+    unittest.main()